@@ -1,5 +1,6 @@
-from motor.motor_asyncio import AsyncIOMotorClient 
-from pymongo import ASCENDING, MongoClient , DESCENDING
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
 import os
 from dotenv import load_dotenv
 
@@ -12,10 +13,13 @@ def connect_to_mongo():
     """Connect to MongoDB and return database instance"""
     global client, database
     
+    # Reuse the existing client so each process keeps a single connection pool
+    if client is not None:
+        return database
+    
     # Get MongoDB URL from environment variable
     mongodb_url = os.getenv("MONGODB_URL")
     database_name = os.getenv("DATABASE_NAME")
-    collection_name = os.getenv("COLLECTION_NAME", "employees")
     print(f"Connecting to MongoDB at: {mongodb_url}")
     print(f"Using database: {database_name}")
     
@@ -24,48 +28,119 @@ def connect_to_mongo():
         raise ValueError("MONGODB_URL environment variable is not set.")
     if not database_name:
         raise ValueError("DATABASE_NAME environment variable is not set.")
-    client = MongoClient(mongodb_url)
+    client = AsyncIOMotorClient(
+        mongodb_url,
+        maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+        minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+        compressors="zstd,snappy",
+        retryWrites=True,
+        appname="emp-api"
+    )
 
     
     # Get database instance
     database = client[database_name]
+        
+    print("✅ Connected to MongoDB successfully!")
+    return database
+
+# Employee collection indexes as (keys, options)
+EMPLOYEE_INDEXES = [
+    ([("employee_id", ASCENDING)], {"unique": True}),
+    # Compound index covering the average salary aggregation
+    ([("department", ASCENDING), ("salary", ASCENDING)], {"name": "dept_salary_index"}),
+    # Department + joining_date listing, extended with the scalar fields list_employees returns
+    ([("department", ASCENDING), ("joining_date", DESCENDING), ("name", ASCENDING), ("salary", ASCENDING), ("employee_id", ASCENDING)], {"name": "list_cover"}),
+    # Index on joining_date for unfiltered listing
+    ([("joining_date", DESCENDING)], {"name": "join_date_index"}),
+    # Text index for skill searching
+    ([("skills", "text")], {"name": "skills_text_search"}),
+    # Multikey index for exact skill lookups sorted by name
+    ([("skills", ASCENDING), ("name", ASCENDING)], {"name": "skills_name_index"}),
+    # Index on name for sorting
+    ([("name", ASCENDING)], {"name": "name_sort_index"}),
+]
+
+# Indexes superseded by a compound index with the same prefix, mapped to
+# their replacement; each is dropped once its replacement exists
+OBSOLETE_EMPLOYEE_INDEXES = {
+    "department_index": "dept_salary_index",
+    "dept_join_date_compound": "list_cover",
+}
+
+# Users collection indexes as (keys, options)
+USER_INDEXES = [
+    ([("username", ASCENDING)], {"unique": True, "name": "username_unique"}),
+]
+
+async def ensure_indexes():
+    """
+    Create collection indexes if they do not exist yet
+
+    Safe to run on every startup: existing indexes are a no-op and builds
+    run in the background so the API can serve traffic meanwhile.
+    """
+    db = get_database()
+    collection_name = os.getenv("COLLECTION_NAME", "employees")
+    created = set()
     
-    database[collection_name].create_index(
-            [("employee_id", ASCENDING)], unique=True
-        )
-    database[collection_name].create_index(
-        [("department", ASCENDING)], 
-        name="department_index"
-    )
-    
-    # Create compound index for department + joining_date queries
-    database[collection_name].create_index(
-        [("department", ASCENDING), ("joining_date", DESCENDING)], 
-        name="dept_join_date_compound"
-    )
+    for name, indexes in ((collection_name, EMPLOYEE_INDEXES), ("users", USER_INDEXES)):
+        for keys, options in indexes:
+            try:
+                await db[name].create_index(keys, background=True, **options)
+                if name == collection_name:
+                    created.add(options.get("name"))
+            except PyMongoError as e:
+                print(f"⚠️ Could not create index {options.get('name', keys)} on {name}: {e}")
     
-    # Create text index for skill searching
-    database[collection_name].create_index(
-        [("skills", "text")], 
-        name="skills_text_search"
-    )
+    # Drop superseded indexes only after their replacement was built
+    try:
+        existing = await db[collection_name].index_information()
+    except PyMongoError as e:
+        print(f"⚠️ Could not read indexes on {collection_name}: {e}")
+        return
     
-    # Create index on name for sorting
-    database[collection_name].create_index(
-        [("name", ASCENDING)], 
-        name="name_sort_index"
-    )
-        
-    print("✅ All indexes created successfully")
+    for index_name, replacement in OBSOLETE_EMPLOYEE_INDEXES.items():
+        if index_name in existing and replacement in created:
+            try:
+                await db[collection_name].drop_index(index_name)
+            except PyMongoError as e:
+                print(f"⚠️ Could not drop index {index_name} on {collection_name}: {e}")
         
-    print("✅ Connected to MongoDB successfully!")
-    return database
+    print("✅ Index creation finished")
+
+async def migrate_joining_dates():
+    """
+    Convert joining_date values stored as ISO strings to BSON Dates
+
+    Older documents were written with isoformat(), and strings sort apart from
+    Dates; once converted this matches nothing and returns immediately.
+    """
+    try:
+        result = await get_collection().update_many(
+            {"joining_date": {"$type": "string"}},
+            # Malformed strings are left as-is instead of aborting the whole update
+            [{"$set": {"joining_date": {"$convert": {"input": "$joining_date", "to": "date", "onError": "$joining_date"}}}}]
+        )
+    except PyMongoError as e:
+        print(f"⚠️ Could not migrate joining_date values: {e}")
+        return
+    
+    if result.modified_count:
+        print(f"🔄 Converted {result.modified_count} joining_date values to dates")
+
+async def prepare_database():
+    """Run data migrations, then create indexes"""
+    await migrate_joining_dates()
+    await ensure_indexes()
 
 def close_connection():
     """Close MongoDB connection"""
-    global client
+    global client, database
     if client:
         client.close()
+        client = None
+        database = None
         print("🔌 MongoDB connection closed")
 
 def get_database():
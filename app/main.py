@@ -1,28 +1,55 @@
-from fastapi import FastAPI, HTTPException, Query, status, Depends
+from fastapi import Body, FastAPI, HTTPException, Query, status, Depends
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from app.models import Employee, EmployeeUpdate, EmployeeResponse, MessageResponse, DepartmentAvgSalary, UserCreate, User, Token
-from app.database import get_collection, connect_to_mongo, close_connection
+from app.database import get_collection, connect_to_mongo, close_connection, prepare_database
 from auth.user_service import create_user, authenticate_user, create_default_admin
 from auth.auth_handler import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from auth.dependencies import get_current_user, get_admin_user
-from pymongo.errors import DuplicateKeyError
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import asyncio
 import os
 
 # Create FastAPI app
 app = FastAPI(
     title="Employee Management API",
     description="A REST API for managing employees with MongoDB and JWT authentication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Largest list accepted by POST /employees/bulk
+MAX_BULK_EMPLOYEES = 1000
+
+# Fields returned by list_employees
+LIST_PROJECTION = {
+    "_id": 0,
+    "employee_id": 1,
+    "name": 1,
+    "department": 1,
+    "salary": 1,
+    "joining_date": 1,
+    "skills": 1
+}
+
+# Keep a reference so the background database setup is not garbage collected
+db_setup_task: Optional[asyncio.Task] = None
+
+def to_bson_date(value: date) -> datetime:
+    """Convert a date to a midnight datetime, which BSON stores as a Date"""
+    return datetime.combine(value, datetime.min.time())
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection on startup"""
+    global db_setup_task
     try:
         connect_to_mongo()
-        create_default_admin()
+        db_setup_task = asyncio.create_task(prepare_database())
+        await create_default_admin()
         print("🚀 Employee Management API started successfully!")
     except Exception as e:
         print(f"❌ Startup failed: {e}")
@@ -30,11 +57,18 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown"""
+    # Stop any database setup still running before its client is closed
+    if db_setup_task is not None and not db_setup_task.done():
+        db_setup_task.cancel()
+        try:
+            await db_setup_task
+        except asyncio.CancelledError:
+            pass
     close_connection()
     print("👋 Employee Management API shutdown")
 
 @app.get("/")
-def root():
+async def root():
     """API health check"""
     return {
         "message": "Employee Management API is running!",
@@ -45,6 +79,7 @@ def root():
             "login": "POST /auth/login",
             "me": "GET /auth/me",
             "create": "POST /employees",
+            "bulk_create": "POST /employees/bulk",
             "get": "GET /employees/{employee_id}",
             "update": "PUT /employees/{employee_id}",
             "delete": "DELETE /employees/{employee_id}",
@@ -57,7 +92,7 @@ def root():
 
 # AUTH ROUTES
 @app.post("/auth/register", response_model=MessageResponse)
-def register_user(user_data: UserCreate):
+async def register_user(user_data: UserCreate):
     """
     Register a new user (admin only)
     
@@ -66,20 +101,20 @@ def register_user(user_data: UserCreate):
     - **email**: User email address
     """
     try:
-        user = create_user(user_data)
+        user = await create_user(user_data)
         return MessageResponse(message=f"User '{user['username']}' created successfully")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @app.post("/auth/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Authenticate user and return access token
     
     - **username**: Registered username
     - **password**: Corresponding password
     """
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -98,7 +133,7 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends()):
     }
 
 @app.get("/auth/me", response_model=User)
-def get_current_user_info(current_user: dict = Depends(get_current_user)):
+async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
     Get current authenticated user info
     
@@ -115,7 +150,7 @@ def get_current_user_info(current_user: dict = Depends(get_current_user)):
 # EMPLOYEE ROUTES
 # 1. CREATE EMPLOYEE
 @app.post("/employees", response_model=MessageResponse, status_code=201)
-def create_employee(employee: Employee, current_user: dict = Depends(get_admin_user)):
+async def create_employee(employee: Employee, current_user: dict = Depends(get_admin_user)):
     """
     Create a new employee record
     
@@ -129,14 +164,14 @@ def create_employee(employee: Employee, current_user: dict = Depends(get_admin_u
     try:
         collection = get_collection()
         
-        # Convert employee to model_dump and handle date
+        # Convert employee to model_dump and store the date as a BSON Date
         employee_dict = employee.model_dump()
-        employee_dict["joining_date"] = employee_dict["joining_date"].isoformat()
+        employee_dict["joining_date"] = to_bson_date(employee.joining_date)
         
         print(f"📝 Creating employee: {employee.employee_id}")
         
         # Insert into MongoDB
-        result = collection.insert_one(employee_dict)
+        result = await collection.insert_one(employee_dict)
         
         if result.inserted_id:
             return MessageResponse(message=f"Employee {employee.employee_id} created successfully")
@@ -154,7 +189,7 @@ def create_employee(employee: Employee, current_user: dict = Depends(get_admin_u
 
 # 6. AVERAGE SALARY BY DEPARTMENT
 @app.get("/employees/avg-salary", response_model=List[DepartmentAvgSalary])
-def get_average_salary_by_department(current_user: dict = Depends(get_current_user)):
+async def get_average_salary_by_department(current_user: dict = Depends(get_current_user)):
     """
     Get average salary by department using MongoDB aggregation
     
@@ -165,8 +200,12 @@ def get_average_salary_by_department(current_user: dict = Depends(get_current_us
         
         print("📊 Calculating average salary by department")
         
-        # MongoDB aggregation pipeline
+        # MongoDB aggregation pipeline; sorting on department first lets the
+        # dept_salary_index feed $group in department order
         pipeline = [
+            {
+                "$sort": {"department": 1}
+            },
             {
                 "$group": {
                     "_id": "$department",
@@ -186,10 +225,11 @@ def get_average_salary_by_department(current_user: dict = Depends(get_current_us
         ]
         
         # Execute aggregation
-        result = list(collection.aggregate(pipeline))
+        result = await collection.aggregate(pipeline).to_list(length=None)
         
         print(f"📈 Found salary data for {len(result)} departments")
-        return [DepartmentAvgSalary(**item) for item in result]
+        # Rows already match DepartmentAvgSalary; response_model validates them once
+        return result
         
     except Exception as e:
         print(f"❌ Error calculating average salary: {e}")
@@ -197,7 +237,7 @@ def get_average_salary_by_department(current_user: dict = Depends(get_current_us
 
 # 7. SEARCH EMPLOYEES BY SKILL
 @app.get("/employees/search", response_model=List[str])
-def search_employees_by_skill(skill: str = Query(..., description="Skill to search for"), current_user: dict = Depends(get_current_user)):
+async def search_employees_by_skill(skill: str = Query(..., description="Skill to search for"), current_user: dict = Depends(get_current_user)):
     """
     Search employees who have the specified skill
     
@@ -208,18 +248,12 @@ def search_employees_by_skill(skill: str = Query(..., description="Skill to sear
         
         print(f"🔎 Searching employees with skill: {skill}")
         
-        # MongoDB query to find skill in array
-        query = {"skills": {"$in": [skill]}}
-        
-        # Find and sort by name
-        cursor = collection.find(query).sort("name", 1)
-        # employees = list(cursor)
+        # Equality on an array field matches any element (multikey index)
+        query = {"skills": skill}
         
-        # cursor = collection.find(query, {"name": 1, "_id": 0}).sort("name", 1)
-        docs = list(cursor)
-
-        # Extract the name from each document
-        names = [doc["name"] for doc in docs]
+        # Find and sort by name, fetching only the name field
+        cursor = collection.find(query, {"name": 1, "_id": 0}).sort("name", 1)
+        names = [doc["name"] async for doc in cursor]
         
         print(f"🎯 Found {len(names)} employees with skill '{skill}'")
         return names
@@ -231,7 +265,7 @@ def search_employees_by_skill(skill: str = Query(..., description="Skill to sear
 
 # 2. GET EMPLOYEE BY ID
 @app.get("/employees/{employee_id}", response_model=EmployeeResponse)
-def get_employee(employee_id: str, current_user: dict = Depends(get_current_user)):
+async def get_employee(employee_id: str, current_user: dict = Depends(get_current_user)):
     """
     Fetch employee details by employee_id
     
@@ -242,8 +276,8 @@ def get_employee(employee_id: str, current_user: dict = Depends(get_current_user
         
         print(f"🔍 Looking for employee: {employee_id}")
         
-        # Find employee in MongoDB
-        employee = collection.find_one({"employee_id": employee_id})
+        # Find employee in MongoDB, leaving out the internal _id
+        employee = await collection.find_one({"employee_id": employee_id}, {"_id": 0})
         
         if not employee:
             raise HTTPException(
@@ -251,12 +285,12 @@ def get_employee(employee_id: str, current_user: dict = Depends(get_current_user
                 detail=f"Employee with ID '{employee_id}' not found"
             )
         
-        # Remove MongoDB _id field and convert date
-        employee.pop("_id", None)
-        if isinstance(employee["joining_date"], str):
-            employee["joining_date"] = datetime.fromisoformat(employee["joining_date"]).date()
+        # Convert stored datetime back to a date
+        if isinstance(employee["joining_date"], datetime):
+            employee["joining_date"] = employee["joining_date"].date()
         
-        return EmployeeResponse(**employee)
+        # Stored documents were validated on write; skip re-validation here
+        return EmployeeResponse.model_construct(**employee)
         
     except HTTPException:
         raise
@@ -266,7 +300,7 @@ def get_employee(employee_id: str, current_user: dict = Depends(get_current_user
 
 # 3. UPDATE EMPLOYEE
 @app.put("/employees/{employee_id}", response_model=MessageResponse)
-def update_employee(employee_id: str, employee_update: EmployeeUpdate, current_user: dict = Depends(get_admin_user)):
+async def update_employee(employee_id: str, employee_update: EmployeeUpdate, current_user: dict = Depends(get_admin_user)):
     """
     Update employee details (partial updates allowed)
     
@@ -275,35 +309,36 @@ def update_employee(employee_id: str, employee_update: EmployeeUpdate, current_u
     try:
         collection = get_collection()
         
-        # Check if employee exists
-        existing = collection.find_one({"employee_id": employee_id})
-        if not existing:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Employee with ID '{employee_id}' not found"
-            )
-        
-        # Prepare update data (only non-None fields)
-        update_data = {}
-        for field, value in employee_update.model_dump().items():
-            if value is not None:
-                if field == "joining_date":
-                    update_data[field] = value.isoformat()
-                else:
-                    update_data[field] = value
+        # Prepare update data (only fields explicitly set to a value)
+        update_data = employee_update.model_dump(exclude_unset=True, exclude_none=True)
+        if "joining_date" in update_data:
+            update_data["joining_date"] = to_bson_date(update_data["joining_date"])
         
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields provided for update")
         
         print(f"✏️ Updating employee {employee_id} with: {update_data}")
         
-        # Update in MongoDB
-        result = collection.update_one(
+        # Update in MongoDB, getting back the previous values of the updated fields
+        previous = await collection.find_one_and_update(
             {"employee_id": employee_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            # employee_id keeps the projected document non-empty for a match
+            projection={"_id": 0, "employee_id": 1, **{field: 1 for field in update_data}},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.modified_count > 0:
+        if previous is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Employee with ID '{employee_id}' not found"
+            )
+        
+        # Documents not yet migrated may still hold an ISO string date
+        if isinstance(previous.get("joining_date"), str):
+            previous["joining_date"] = to_bson_date(datetime.fromisoformat(previous["joining_date"]).date())
+        
+        if any(previous.get(field) != value for field, value in update_data.items()):
             return MessageResponse(message=f"Employee {employee_id} updated successfully")
         else:
             return MessageResponse(message="No changes made")
@@ -316,7 +351,7 @@ def update_employee(employee_id: str, employee_update: EmployeeUpdate, current_u
 
 # 4. DELETE EMPLOYEE
 @app.delete("/employees/{employee_id}", response_model=MessageResponse)
-def delete_employee(employee_id: str, current_user: dict = Depends(get_admin_user)):
+async def delete_employee(employee_id: str, current_user: dict = Depends(get_admin_user)):
     """
     Delete employee record
     
@@ -328,7 +363,7 @@ def delete_employee(employee_id: str, current_user: dict = Depends(get_admin_use
         print(f"🗑️ Deleting employee: {employee_id}")
         
         # Delete from MongoDB
-        result = collection.delete_one({"employee_id": employee_id})
+        result = await collection.delete_one({"employee_id": employee_id})
         
         if result.deleted_count > 0:
             return MessageResponse(message=f"Employee {employee_id} deleted successfully")
@@ -345,8 +380,12 @@ def delete_employee(employee_id: str, current_user: dict = Depends(get_admin_use
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 # 5. LIST EMPLOYEES BY DEPARTMENT
-@app.get("/employees", response_model=List[EmployeeResponse])
-def list_employees(
+@app.get(
+    "/employees",
+    response_model=None,
+    responses={200: {"model": List[EmployeeResponse]}}
+)
+async def list_employees(
     department: Optional[str] = Query(None, description="Filter by department"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
@@ -371,27 +410,85 @@ def list_employees(
         # Calculate skip for pagination
         skip = (page - 1) * limit
         
-        cursor = collection.find(query).skip(skip).limit(limit)
-        employees = list(cursor)
+        # Sort before paginating so MongoDB can walk the joining_date indexes
+        cursor = collection.find(query, LIST_PROJECTION).sort("joining_date", DESCENDING).skip(skip).limit(limit)
+        employees = await cursor.to_list(length=limit)
 
-        # Sort by parsing ISO date, then convert to DD/MM/YYYY
+        # Convert stored datetimes back to dates
         for emp in employees:
-            if isinstance(emp["joining_date"], str):               
-                emp["joining_date"] = datetime.fromisoformat(emp["joining_date"]).date()
-                
-        employees_sorted = sorted(
-        employees,
-        key=lambda emp: emp["joining_date"],
-        reverse=False
-        )
+            if isinstance(emp["joining_date"], datetime):
+                emp["joining_date"] = emp["joining_date"].date()
 
-        return employees_sorted
+        # Documents come straight from MongoDB, so skip response model validation
+        return ORJSONResponse(content=employees)
         
     except Exception as e:
         print(f"❌ Error listing employees: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# 8. BULK CREATE EMPLOYEES
+@app.post(
+    "/employees/bulk",
+    response_model=MessageResponse,
+    status_code=201,
+    responses={
+        207: {"description": "Some employees were created; `errors` lists the rejected ones"},
+        400: {"description": "No employees were created; `errors` lists why"}
+    }
+)
+async def create_employees_bulk(
+    employees: List[Employee] = Body(..., max_length=MAX_BULK_EMPLOYEES),
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Create multiple employee records in a single database round-trip
+    
+    Accepts up to 1000 employees with the same fields as POST /employees.
+    Valid records are inserted even if others fail. Failures are returned as
+    {"message", "errors"} with 207 when some were inserted, 400 when none were.
+    """
+    if not employees:
+        raise HTTPException(status_code=400, detail="No employees provided")
+    
+    try:
+        collection = get_collection()
+        
+        # Convert employees to dicts and store dates as BSON Dates
+        docs = [
+            {**employee.model_dump(), "joining_date": to_bson_date(employee.joining_date)}
+            for employee in employees
+        ]
+        
+        print(f"📝 Bulk creating {len(docs)} employees")
+        
+        # Insert into MongoDB without stopping at the first failure
+        result = await collection.insert_many(docs, ordered=False, bypass_document_validation=False)
+        
+        return MessageResponse(message=f"{len(result.inserted_ids)} employees created successfully")
+        
+    except BulkWriteError as e:
+        errors = []
+        for error in e.details.get("writeErrors", []):
+            employee_id = employees[error["index"]].employee_id
+            if error.get("code") == 11000:
+                message = f"Employee ID '{employee_id}' already exists"
+            else:
+                message = error.get("errmsg", "Write failed")
+            errors.append({"index": error["index"], "employee_id": employee_id, "error": message})
+        
+        inserted = e.details.get("nInserted", 0)
+        content = {
+            "message": f"{inserted} of {len(employees)} employees created",
+            "errors": errors
+        }
+        
+        # Same body either way; 207 tells clients some records were written
+        return ORJSONResponse(status_code=207 if inserted > 0 else 400, content=content)
+    except Exception as e:
+        print(f"❌ Error bulk creating employees: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 
 if __name__ == "__main__":
     import uvicorn
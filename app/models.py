@@ -32,14 +32,8 @@ class EmployeeUpdate(BaseModel):
     joining_date: Optional[date] = None
     skills: Optional[List[str]] = None
 
-class EmployeeResponse(BaseModel):
-    """Model for employee responses"""
-    employee_id: str
-    name: str
-    department: str
-    salary: float
-    joining_date: date
-    skills: List[str]
+class EmployeeResponse(Employee):
+    """Model for employee responses (same fields as Employee)"""
 
 class MessageResponse(BaseModel):
     """Standard response model"""
@@ -27,7 +27,8 @@ class JWTBearer(HTTPBearer):
             request: FastAPI Request object
         
         Returns:
-            JWT token string if valid
+            JWT token string if valid (decoded payload is stored on
+            request.state.jwt_payload)
         
         Raises:
             HTTPException: If authentication fails
@@ -44,31 +45,19 @@ class JWTBearer(HTTPBearer):
                 )
             
             # Validate JWT token
-            if not self.verify_jwt(credentials.credentials):
+            try:
+                payload = decode_jwt(credentials.credentials)
+            except Exception:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Invalid token or expired token"
                 )
             
+            # Keep the decoded payload so dependencies don't decode it again
+            request.state.jwt_payload = payload
             return credentials.credentials
         else:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid authorization code"
             )
-
-    def verify_jwt(self, token: str) -> bool:
-        """
-        Verify JWT token validity
-        
-        Args:
-            token: JWT token string
-        
-        Returns:
-            True if token is valid, False otherwise
-        """
-        try:
-            payload = decode_jwt(token)
-            return True
-        except Exception:
-            return False
@@ -1,24 +1,35 @@
 import jwt
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
 from passlib.context import CryptContext
 from typing import Optional
+from cachetools import TTLCache
 
 # Configuration from environment
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded payloads of recently seen tokens, keyed by the raw token string
+_decoded_token_cache = TTLCache(maxsize=10000, ttl=60)
+
+# Password hashing context: new hashes use argon2id, existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plain text password against its bcrypt hash
+    Verify a plain text password against its stored hash
     
     Args:
         plain_password: Password entered by user
-        hashed_password: Stored bcrypt hash from database
+        hashed_password: Stored argon2 or bcrypt hash from database
     
     Returns:
         True if password matches, False otherwise
@@ -27,13 +38,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a plain text password using bcrypt
+    Hash a plain text password using argon2id
     
     Args:
         password: Plain text password
     
     Returns:
-        Bcrypt hash string
+        Argon2 hash string
     """
     return pwd_context.hash(password)
 
@@ -50,16 +61,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
     
-    # Set expiration time
+    # Set expiration time (integer epoch seconds)
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     # Add standard JWT claims
     to_encode.update({
         "exp": expire,  # Expiration time
-        "iat": datetime.utcnow(),  # Issued at time
+        "iat": now,  # Issued at time
         "type": "access"  # Token type
     })
     
@@ -80,9 +92,17 @@ def decode_jwt(token: str) -> dict:
     Raises:
         Exception: If token is invalid or expired
     """
+    # Reuse a cached payload while the token has not expired
+    payload = _decoded_token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _decoded_token_cache.pop(token, None)
+    
     try:
         # Decode JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        _decoded_token_cache[token] = payload
         return payload
     except jwt.ExpiredSignatureError:
         raise Exception("Token has expired")
@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from .auth_bearer import JWTBearer
 from .auth_handler import decode_jwt
 from .user_service import get_user_by_username
@@ -8,11 +8,12 @@ from typing import Optional
 # Create JWT bearer instance
 jwt_bearer = JWTBearer()
 
-def get_current_user(token: str = Depends(jwt_bearer)) -> dict:
+async def get_current_user(request: Request, token: str = Depends(jwt_bearer)) -> dict:
     """
     Dependency to get current authenticated user
     
     Args:
+        request: Incoming request carrying the payload decoded by JWTBearer
         token: JWT token from Authorization header
     
     Returns:
@@ -22,8 +23,10 @@ def get_current_user(token: str = Depends(jwt_bearer)) -> dict:
         HTTPException: If token is invalid or user not found
     """
     try:
-        # Decode JWT token
-        payload = decode_jwt(token)
+        # Reuse the payload decoded by JWTBearer, decoding only as a fallback
+        payload = getattr(request.state, "jwt_payload", None)
+        if payload is None:
+            payload = decode_jwt(token)
         username: Optional[str] = payload.get("sub")
         
         if username is None:
@@ -47,7 +50,7 @@ def get_current_user(token: str = Depends(jwt_bearer)) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Username missing in token"
         )
-    user = get_user_by_username(username=token_data.username)
+    user = await get_user_by_username(username=token_data.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,7 +59,7 @@ def get_current_user(token: str = Depends(jwt_bearer)) -> dict:
     
     return user
 
-def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
+async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
     """
     Dependency to require admin role
     
@@ -76,7 +79,7 @@ def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
         )
     return current_user
 
-def get_current_active_user(current_user: dict = Depends(get_current_user)) -> dict:
+async def get_current_active_user(current_user: dict = Depends(get_current_user)) -> dict:
     """
     Dependency to ensure user is active
     
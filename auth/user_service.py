@@ -1,19 +1,24 @@
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo.errors import DuplicateKeyError
 from app.database import get_database
 from app.models import UserCreate, User
 from .auth_handler import get_password_hash, verify_password
 from datetime import datetime
 from typing import Optional
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
 
-def get_user_collection() -> Collection:
+# Recently looked-up user documents, keyed by username
+_user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+def get_user_collection() -> AsyncIOMotorCollection:
     """Get MongoDB users collection"""
     db = get_database()
     if db is None:
         raise RuntimeError("Database connection not established. get_database() returned None.")
     return db["users"]
 
-def create_user(user_data: UserCreate) -> dict:
+async def create_user(user_data: UserCreate) -> dict:
     """
     Create a new user account
     
@@ -29,15 +34,15 @@ def create_user(user_data: UserCreate) -> dict:
     collection = get_user_collection()
     
     # Check if username already exists
-    if collection.find_one({"username": user_data.username}):
+    if await collection.find_one({"username": user_data.username}, {"_id": 1}):
         raise Exception("Username already exists")
     
     # Check if email already exists
-    if collection.find_one({"email": user_data.email}):
+    if await collection.find_one({"email": user_data.email}, {"_id": 1}):
         raise Exception("Email already registered")
     
     # Hash password for secure storage
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     
     # Create user document
     user_doc = {
@@ -50,12 +55,13 @@ def create_user(user_data: UserCreate) -> dict:
     }
     
     # Insert into database
-    result = collection.insert_one(user_doc)
+    result = await collection.insert_one(user_doc)
     user_doc["_id"] = str(result.inserted_id)
+    invalidate_user_cache(user_data.username)
     
     return user_doc
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
+async def authenticate_user(username: str, password: str) -> Optional[dict]:
     """
     Authenticate user credentials
     
@@ -69,12 +75,12 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
     collection = get_user_collection()
     
     # Find user by username
-    user = collection.find_one({"username": username})
+    user = await collection.find_one({"username": username})
     if not user:
         return None
     
-    # Verify password against stored hash
-    if not verify_password(password, user["hashed_password"]):
+    # Verify password against stored hash (CPU-bound, keep it off the event loop)
+    if not await run_in_threadpool(verify_password, password, user["hashed_password"]):
         return None
     
     # Check if user is active
@@ -83,7 +89,7 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
     
     return user
 
-def get_user_by_username(username: str) -> Optional[dict]:
+async def get_user_by_username(username: str) -> Optional[dict]:
     """
     Get user by username
     
@@ -93,15 +99,31 @@ def get_user_by_username(username: str) -> Optional[dict]:
     Returns:
         User document or None if not found
     """
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+    
     collection = get_user_collection()
-    return collection.find_one({"username": username})
+    user = await collection.find_one({"username": username})
+    if user is not None:
+        _user_cache[username] = user
+    return user
+
+def invalidate_user_cache(username: str) -> None:
+    """
+    Drop a cached user document after it has been modified
+    
+    Args:
+        username: Username whose cached document is stale
+    """
+    _user_cache.pop(username, None)
 
-def create_default_admin():
+async def create_default_admin():
     """Create default admin user if none exists"""
     collection = get_user_collection()
     
     # Check if any admin exists
-    admin_exists = collection.find_one({"role": "admin"})
+    admin_exists = await collection.find_one({"role": "admin"}, {"_id": 1})
     if admin_exists:
         return
     
@@ -114,7 +136,7 @@ def create_default_admin():
     )
     
     try:
-        create_user(admin_data)
+        await create_user(admin_data)
         print("✅ Default admin user created: admin/admin123")
     except Exception as e:
         print(f"❌ Error creating default admin: {e}")
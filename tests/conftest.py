@@ -0,0 +1,33 @@
+import pytest_asyncio
+from httpx import AsyncClient
+from mongomock_motor import AsyncMongoMockClient
+import app.database as database
+from app.main import app
+from auth.dependencies import get_admin_user, get_current_user
+
+ADMIN_USER = {
+    "username": "admin",
+    "email": "admin@company.com",
+    "role": "admin",
+    "is_active": True
+}
+
+@pytest_asyncio.fixture
+async def employees(monkeypatch):
+    """In-memory employees collection with the unique employee_id index"""
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(database, "client", client)
+    monkeypatch.setattr(database, "database", client["test_db"])
+    
+    collection = database.get_collection()
+    await collection.create_index([("employee_id", 1)], unique=True)
+    return collection
+
+@pytest_asyncio.fixture
+async def admin_client(employees):
+    """HTTP client authenticated as an admin user"""
+    app.dependency_overrides[get_admin_user] = lambda: ADMIN_USER
+    app.dependency_overrides[get_current_user] = lambda: ADMIN_USER
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
@@ -0,0 +1,63 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import bcrypt
+import pytest
+from auth.auth_handler import SECRET_KEY, create_access_token, decode_jwt, get_password_hash, verify_password
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def sign_hs256(header: dict, payload: dict) -> str:
+    """Build a token with an HS256 signature over arbitrary header/payload"""
+    signing_input = f"{b64url(json.dumps(header).encode())}.{b64url(json.dumps(payload).encode())}"
+    signature = hmac.new(SECRET_KEY.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{b64url(signature)}"
+
+def test_decode_valid_token():
+    token = create_access_token({"sub": "alice", "role": "user"})
+    payload = decode_jwt(token)
+    assert payload["sub"] == "alice"
+    assert payload["role"] == "user"
+
+def test_decode_rejects_tampered_payload():
+    header, _, signature = create_access_token({"sub": "alice", "role": "user"}).split(".")
+    forged = b64url(json.dumps({"sub": "alice", "role": "admin", "exp": int(time.time()) + 60}).encode())
+    with pytest.raises(Exception, match="Invalid token"):
+        decode_jwt(f"{header}.{forged}.{signature}")
+
+def test_decode_rejects_bad_signature():
+    token = create_access_token({"sub": "alice"})
+    signing_input, _, _ = token.rpartition(".")
+    with pytest.raises(Exception, match="Invalid token"):
+        decode_jwt(f"{signing_input}.{b64url(b'not-the-signature')}")
+
+def test_decode_rejects_expired_token():
+    now = int(time.time())
+    token = sign_hs256({"alg": "HS256", "typ": "JWT"}, {"sub": "alice", "iat": now - 120, "exp": now - 60})
+    with pytest.raises(Exception, match="Token has expired"):
+        decode_jwt(token)
+
+def test_decode_rejects_alg_mismatch():
+    now = int(time.time())
+    token = sign_hs256({"alg": "none", "typ": "JWT"}, {"sub": "alice", "iat": now, "exp": now + 60})
+    with pytest.raises(Exception, match="Invalid token"):
+        decode_jwt(token)
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b.c"])
+def test_decode_rejects_malformed_token(token):
+    with pytest.raises(Exception, match="Invalid token"):
+        decode_jwt(token)
+
+def test_legacy_bcrypt_hash_still_verifies():
+    legacy_hash = bcrypt.hashpw(b"admin123", bcrypt.gensalt(rounds=4)).decode()
+    assert legacy_hash.startswith("$2b$")
+    assert verify_password("admin123", legacy_hash)
+    assert not verify_password("wrong-password", legacy_hash)
+
+def test_new_hashes_use_argon2():
+    hashed = get_password_hash("admin123")
+    assert hashed.startswith("$argon2id$")
+    assert verify_password("admin123", hashed)
@@ -0,0 +1,38 @@
+import pytest
+from pymongo.errors import OperationFailure
+import app.database as database
+
+async def create_legacy_indexes(collection):
+    await collection.create_index([("department", 1)], name="department_index")
+    await collection.create_index([("department", 1), ("joining_date", -1)], name="dept_join_date_compound")
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_replaces_obsolete_indexes(employees):
+    await create_legacy_indexes(employees)
+    
+    await database.ensure_indexes()
+    
+    indexes = await employees.index_information()
+    assert "dept_salary_index" in indexes
+    assert "list_cover" in indexes
+    assert "department_index" not in indexes
+    assert "dept_join_date_compound" not in indexes
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_keeps_obsolete_index_when_replacement_fails(employees, monkeypatch):
+    await create_legacy_indexes(employees)
+    collection_class = type(employees)
+    create_index = collection_class.create_index
+    
+    async def failing_create_index(self, keys, **kwargs):
+        if kwargs.get("name") == "list_cover":
+            raise OperationFailure("index build failed")
+        return await create_index(self, keys, **kwargs)
+    
+    monkeypatch.setattr(collection_class, "create_index", failing_create_index)
+    await database.ensure_indexes()
+    
+    indexes = await employees.index_information()
+    assert "list_cover" not in indexes
+    assert "dept_join_date_compound" in indexes
+    assert "department_index" not in indexes
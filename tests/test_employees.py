@@ -0,0 +1,128 @@
+import pytest
+from httpx import AsyncClient
+from app.main import MAX_BULK_EMPLOYEES
+
+def employee_data(employee_id: str, **overrides) -> dict:
+    data = {
+        "employee_id": employee_id,
+        "name": f"Employee {employee_id}",
+        "department": "Engineering",
+        "salary": 75000,
+        "joining_date": "2023-01-15",
+        "skills": ["Python", "MongoDB"]
+    }
+    data.update(overrides)
+    return data
+
+@pytest.mark.asyncio
+async def test_bulk_create_all_inserted(admin_client: AsyncClient, employees):
+    payload = [employee_data("E001"), employee_data("E002"), employee_data("E003")]
+    
+    response = await admin_client.post("/employees/bulk", json=payload)
+    assert response.status_code == 201
+    assert response.json()["message"] == "3 employees created successfully"
+    assert await employees.count_documents({}) == 3
+
+@pytest.mark.asyncio
+async def test_bulk_create_duplicate_in_middle(admin_client: AsyncClient, employees):
+    payload = [employee_data("E001"), employee_data("E001"), employee_data("E002")]
+    
+    response = await admin_client.post("/employees/bulk", json=payload)
+    assert response.status_code == 207
+    data = response.json()
+    assert data["message"] == "2 of 3 employees created"
+    assert data["errors"] == [
+        {"index": 1, "employee_id": "E001", "error": "Employee ID 'E001' already exists"}
+    ]
+    assert await employees.count_documents({}) == 2
+
+@pytest.mark.asyncio
+async def test_bulk_create_nothing_inserted(admin_client: AsyncClient, employees):
+    await admin_client.post("/employees/bulk", json=[employee_data("E001")])
+    
+    response = await admin_client.post("/employees/bulk", json=[employee_data("E001")])
+    assert response.status_code == 400
+    data = response.json()
+    assert data["message"] == "0 of 1 employees created"
+    assert data["errors"] == [
+        {"index": 0, "employee_id": "E001", "error": "Employee ID 'E001' already exists"}
+    ]
+
+@pytest.mark.asyncio
+async def test_bulk_create_empty_list(admin_client: AsyncClient, employees):
+    response = await admin_client.post("/employees/bulk", json=[])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No employees provided"
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_oversized_list(admin_client: AsyncClient, employees):
+    payload = [employee_data(f"E{i:04d}") for i in range(MAX_BULK_EMPLOYEES + 1)]
+    
+    response = await admin_client.post("/employees/bulk", json=payload)
+    assert response.status_code == 422
+    assert await employees.count_documents({}) == 0
+
+@pytest.mark.asyncio
+async def test_joining_date_round_trip(admin_client: AsyncClient, employees):
+    await admin_client.post("/employees", json=employee_data("E001", joining_date="2023-01-15"))
+    
+    single = await admin_client.get("/employees/E001")
+    listed = await admin_client.get("/employees")
+    assert single.status_code == 200
+    assert listed.status_code == 200
+    assert single.json()["joining_date"] == "2023-01-15"
+    assert [emp["joining_date"] for emp in listed.json()] == ["2023-01-15"]
+
+@pytest.mark.asyncio
+async def test_update_same_value_reports_no_changes(admin_client: AsyncClient, employees):
+    await admin_client.post("/employees", json=employee_data("E001"))
+    
+    response = await admin_client.put("/employees/E001", json={"salary": 75000, "joining_date": "2023-01-15"})
+    assert response.status_code == 200
+    assert response.json()["message"] == "No changes made"
+
+@pytest.mark.asyncio
+async def test_update_changed_value(admin_client: AsyncClient, employees):
+    await admin_client.post("/employees", json=employee_data("E001"))
+    
+    response = await admin_client.put("/employees/E001", json={"salary": 80000})
+    assert response.status_code == 200
+    assert response.json()["message"] == "Employee E001 updated successfully"
+    assert (await employees.find_one({"employee_id": "E001"}))["salary"] == 80000
+
+@pytest.mark.asyncio
+async def test_update_legacy_string_date_same_value(admin_client: AsyncClient, employees):
+    await employees.insert_one({**employee_data("E001"), "joining_date": "2023-01-15"})
+    
+    response = await admin_client.put("/employees/E001", json={"joining_date": "2023-01-15"})
+    assert response.status_code == 200
+    assert response.json()["message"] == "No changes made"
+
+@pytest.mark.asyncio
+async def test_update_unknown_employee(admin_client: AsyncClient, employees):
+    response = await admin_client.put("/employees/E404", json={"salary": 80000})
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_update_all_null_body(admin_client: AsyncClient, employees):
+    await admin_client.post("/employees", json=employee_data("E001"))
+    
+    response = await admin_client.put("/employees/E001", json={"name": None, "salary": None})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No fields provided for update"
+
+@pytest.mark.asyncio
+async def test_list_employees_newest_first_across_pages(admin_client: AsyncClient, employees):
+    payload = [
+        employee_data("E001", joining_date="2021-06-01"),
+        employee_data("E002", joining_date="2023-03-10"),
+        employee_data("E003", joining_date="2022-09-20")
+    ]
+    await admin_client.post("/employees/bulk", json=payload)
+    
+    first = await admin_client.get("/employees", params={"page": 1, "limit": 2})
+    second = await admin_client.get("/employees", params={"page": 2, "limit": 2})
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert [emp["employee_id"] for emp in first.json()] == ["E002", "E003"]
+    assert [emp["employee_id"] for emp in second.json()] == ["E001"]